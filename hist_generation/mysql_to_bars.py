@@ -11,25 +11,240 @@ Example
 """
 from __future__ import annotations
 
-from typing import Tuple, List
+import hashlib
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple, List
 
+import numpy as np
 import pandas as pd
-import mysql.connector
 import yaml
+from mysql.connector import pooling
 
 from nautilus_trader.model.data import Bar, BarType
-from nautilus_trader.persistence.wranglers import BarDataWrangler
 from nautilus_trader.test_kit.providers import TestInstrumentProvider
 
 CONFIG_PATH = "hist_generation/config.yaml"
 
+# Processed bar frames are cached here as Parquet, keyed by database, series and window
+BAR_CACHE_DIR = ".bar_cache"
+
+# Rows fetched per round-trip when streaming bars out of MySQL
+READ_CHUNK_SIZE = 100_000
+
+# The pool opens every connection up front, and a load only ever uses one
+POOL_SIZE = 1
+
+BAR_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+BARS_WHERE_SQL = "FROM aggregates WHERE ticker=%s AND multiplier=%s AND timespan=%s"
+COUNT_BARS_SQL = "SELECT COUNT(*) {where}"
+SELECT_BARS_SQL = (
+    "SELECT dt_utc AS timestamp, `open`, `high`, `low`, `close`, `volume` "
+    "{where} ORDER BY ts_ms"
+)
+
 
 def _load_config(path: str) -> dict:
     with open(path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
 
 
-def load_bars_from_mysql(config_path: str = CONFIG_PATH) -> Tuple[List[Bar], BarType, object]:
+# Connection pools keyed by process and server, so forked workers never share sockets
+_POOLS: Dict[tuple, pooling.MySQLConnectionPool] = {}
+
+
+def _get_pool(mysql_cfg: dict) -> pooling.MySQLConnectionPool:
+    key = (
+        os.getpid(),
+        mysql_cfg["host"],
+        int(mysql_cfg["port"]),
+        mysql_cfg["username"],
+        mysql_cfg["database"],
+    )
+    pool = _POOLS.get(key)
+    if pool is None:
+        pool = pooling.MySQLConnectionPool(
+            pool_name=f"bars{len(_POOLS)}",
+            pool_size=POOL_SIZE,
+            host=mysql_cfg["host"],
+            port=int(mysql_cfg["port"]),
+            user=mysql_cfg["username"],
+            password=mysql_cfg["password"],
+            database=mysql_cfg["database"],
+        )
+        _POOLS[key] = pool
+    return pool
+
+
+def _to_epoch_ms(dt: datetime) -> int:
+    # Naive datetimes are taken as UTC, matching `dt_utc`
+    ts = pd.Timestamp(dt)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return ts.value // 1_000_000
+
+
+def _bars_filter(
+    ticker: str,
+    multiplier: int,
+    timespan: str,
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> Tuple[str, tuple]:
+    """
+    Return the FROM/WHERE clause and its parameters for one series.
+
+    Time bounds are applied to ``ts_ms`` so MySQL can range-scan the primary
+    key ``(ticker, multiplier, timespan, ts_ms)``.
+    """
+    where = BARS_WHERE_SQL
+    params: list = [ticker, multiplier, timespan]
+    if start is not None:
+        where += " AND ts_ms >= %s"
+        params.append(_to_epoch_ms(start))
+    if end is not None:
+        where += " AND ts_ms <= %s"
+        params.append(_to_epoch_ms(end))
+    return where, tuple(params)
+
+
+def _read_bars_frame(
+    conn: pooling.PooledMySQLConnection,
+    where: str,
+    params: tuple,
+) -> pd.DataFrame:
+    """
+    Stream the matching aggregates into preallocated typed arrays.
+
+    Only the narrow float64 OHLCV block and the timestamps are kept, rather
+    than materializing the whole result set through a single ``read_sql``.
+    """
+    # Both reads share one snapshot, so a concurrent ingest cannot outgrow the count
+    conn.start_transaction(
+        consistent_snapshot=True,
+        isolation_level="REPEATABLE READ",
+        readonly=True,
+    )
+    try:
+        cur = conn.cursor(buffered=True)
+        try:
+            cur.execute(COUNT_BARS_SQL.format(where=where), params)
+            (count,) = cur.fetchone()
+        finally:
+            cur.close()
+
+        timestamps = np.empty(count, dtype="datetime64[ns]")
+        values = np.empty((count, len(BAR_COLUMNS)), dtype=np.float64)
+
+        offset = 0
+        for chunk in pd.read_sql(
+            SELECT_BARS_SQL.format(where=where),
+            conn,
+            params=params,
+            parse_dates=["timestamp"],
+            chunksize=READ_CHUNK_SIZE,
+        ):
+            end = offset + len(chunk)
+            timestamps[offset:end] = chunk["timestamp"].to_numpy(dtype="datetime64[ns]")
+            values[offset:end] = chunk[BAR_COLUMNS].to_numpy(dtype=np.float64)
+            offset = end
+    finally:
+        conn.rollback()  # Ends the read-only transaction
+
+    return pd.DataFrame(
+        values[:offset],
+        index=pd.DatetimeIndex(timestamps[:offset], name="timestamp"),
+        columns=BAR_COLUMNS,
+    )
+
+
+def _cache_path(cache_dir: str, mysql_cfg: dict, params: tuple) -> Path:
+    key = "{}:{}/{}|".format(mysql_cfg["host"], mysql_cfg["port"], mysql_cfg["database"])
+    key += "-".join(str(p) for p in params)
+    return Path(cache_dir) / f"{hashlib.sha1(key.encode(), usedforsecurity=False).hexdigest()}.parquet"
+
+
+def _write_cache(df: pd.DataFrame, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    df.to_parquet(tmp_path, compression="zstd")
+    os.replace(tmp_path, path)  # Readers never see a partially written file
+
+
+def _check_bar_values(
+    opens: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    volumes: np.ndarray,
+    price_precision: int,
+) -> None:
+    """
+    Apply the checks of the ``Bar`` constructor across whole columns.
+
+    ``Bar.from_raw_arrays_to_list`` builds bars without validating them, so a
+    corrupt row must be rejected here rather than flow into a backtest.
+
+    Raises
+    ------
+    ValueError
+        If any value is not finite, or any row breaks the OHLC invariants.
+
+    """
+    # Compare the raw fixed-point values, built as Rust does: scale then round half away from zero
+    scale = 10.0**price_precision
+    o, h, lo, c = (np.trunc(a * scale + np.copysign(0.5, a)) for a in (opens, highs, lows, closes))
+    invalid = ~(
+        np.isfinite(o)
+        & np.isfinite(h)
+        & np.isfinite(lo)
+        & np.isfinite(c)
+        & np.isfinite(volumes)
+    )
+    invalid |= (h < o) | (h < lo) | (h < c) | (lo > c) | (lo > o)
+
+    bad_rows = np.flatnonzero(invalid)
+    if bad_rows.size:
+        i = bad_rows[0]
+        raise ValueError(
+            f"{bad_rows.size} invalid bar(s), first at row {i}: "
+            f"open={opens[i]}, high={highs[i]}, low={lows[i]}, close={closes[i]}, volume={volumes[i]}",
+        )
+
+
+def _bars_from_frame(df: pd.DataFrame, bar_type: BarType, instrument) -> List[Bar]:
+    # Contiguous typed columns (copies keep the buffers writable for the typed memoryviews)
+    opens = df["open"].to_numpy(dtype=np.float64, copy=True)
+    highs = df["high"].to_numpy(dtype=np.float64, copy=True)
+    lows = df["low"].to_numpy(dtype=np.float64, copy=True)
+    closes = df["close"].to_numpy(dtype=np.float64, copy=True)
+    volumes = df["volume"].to_numpy(dtype=np.float64, copy=True)
+    _check_bar_values(opens, highs, lows, closes, volumes, instrument.price_precision)
+
+    # Build the bars in a single Cython loop
+    ts_events = df.index.asi8.astype(np.uint64)
+    return Bar.from_raw_arrays_to_list(
+        bar_type,
+        instrument.price_precision,
+        instrument.size_precision,
+        opens,
+        highs,
+        lows,
+        closes,
+        volumes,
+        ts_events,
+        ts_events.copy(),
+    )
+
+
+def load_bars_from_mysql(
+    config_path: str = CONFIG_PATH,
+    cache_dir: Optional[str] = BAR_CACHE_DIR,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Tuple[List[Bar], BarType, object]:
     """Load OHLCV bars from MySQL using the given configuration.
 
     Parameters
@@ -37,12 +252,27 @@ def load_bars_from_mysql(config_path: str = CONFIG_PATH) -> Tuple[List[Bar], Bar
     config_path : str
         Path to the YAML configuration file with ``polygon`` and ``mysql``
         sections.
+    cache_dir : str, optional
+        Directory for the Parquet cache of loaded bars. The first load of a
+        series is written there and later loads skip MySQL entirely; delete the
+        cached file after re-ingesting. If ``None`` then always query MySQL.
+    start : datetime, optional
+        The inclusive start of the bars to load (naive values are UTC). If
+        ``None`` then load from the first stored bar.
+    end : datetime, optional
+        The inclusive end of the bars to load (naive values are UTC). If
+        ``None`` then load up to the last stored bar.
 
     Returns
     -------
     tuple
         A tuple of ``(bars, bar_type, instrument)`` where ``bars`` is a list of
         :class:`~nautilus_trader.model.data.Bar` objects ready for backtesting.
+
+    Raises
+    ------
+    ValueError
+        If no bars are stored for the series in the requested range.
     """
     cfg = _load_config(config_path)
     poly_cfg = cfg["polygon"]
@@ -52,35 +282,33 @@ def load_bars_from_mysql(config_path: str = CONFIG_PATH) -> Tuple[List[Bar], Bar
     multiplier = int(poly_cfg["multiplier"])
     timespan = poly_cfg["timespan"].lower()
 
-    conn = mysql.connector.connect(
-        host=mysql_cfg["host"],
-        port=int(mysql_cfg["port"]),
-        user=mysql_cfg["username"],
-        password=mysql_cfg["password"],
-        database=mysql_cfg["database"],
-    )
+    where, params = _bars_filter(ticker, multiplier, timespan, start, end)
+    cache_path = _cache_path(cache_dir, mysql_cfg, params) if cache_dir else None
 
-    query = (
-        "SELECT dt_utc AS timestamp, `open`, `high`, `low`, `close`, `volume` "
-        "FROM aggregates WHERE ticker=%s AND multiplier=%s AND timespan=%s ORDER BY ts_ms"
-    )
-    df = pd.read_sql(
-        query,
-        conn,
-        params=(ticker, multiplier, timespan),
-        parse_dates=["timestamp"],
-    )
-    conn.close()
+    if cache_path is not None and cache_path.exists():
+        df = pd.read_parquet(cache_path, engine="pyarrow")
+    else:
+        conn = _get_pool(mysql_cfg).get_connection()
+        try:
+            df = _read_bars_frame(conn, where, params)
+        finally:
+            conn.close()  # Returns the connection to the pool
+
+        # Never cache an empty result, or later loads would miss bars ingested afterwards
+        if df.empty:
+            raise ValueError(
+                f"No bars stored for {ticker} {multiplier}-{timespan} in the requested range",
+            )
 
-    df = df.set_index("timestamp")
+        if cache_path is not None:
+            _write_cache(df, cache_path)
 
     instrument = TestInstrumentProvider.equity(symbol=ticker, venue="XNAS")
     bar_type = BarType.from_str(
         f"{instrument.id}-{multiplier}-{timespan.upper()}-LAST-EXTERNAL"
     )
 
-    wrangler = BarDataWrangler(bar_type, instrument)
-    bars: List[Bar] = wrangler.process(df)
+    bars = _bars_from_frame(df, bar_type, instrument)
 
     return bars, bar_type, instrument
 
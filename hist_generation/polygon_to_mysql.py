@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 import argparse
+import csv
 import math
 import os
+import tempfile
 import time
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from functools import lru_cache
+from itertools import chain, repeat
+from operator import attrgetter
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
+import pandas as pd
 import yaml
 from polygon import RESTClient
 import mysql.connector
@@ -100,22 +108,46 @@ CREATE TABLE IF NOT EXISTS `aggregates` (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
 """
 
-INSERT_SQL = """
-INSERT INTO `aggregates`
-(`ticker`,`multiplier`,`timespan`,`ts_ms`,`dt_utc`,`open`,`high`,`low`,`close`,`volume`,`vwap`,`transactions`)
-VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-ON DUPLICATE KEY UPDATE
-  `open`=VALUES(`open`),
-  `high`=VALUES(`high`),
-  `low`=VALUES(`low`),
-  `close`=VALUES(`close`),
-  `volume`=VALUES(`volume`),
-  `vwap`=VALUES(`vwap`),
-  `transactions`=VALUES(`transactions`)
+AGG_COLUMNS = (
+    "ticker",
+    "multiplier",
+    "timespan",
+    "ts_ms",
+    "dt_utc",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "vwap",
+    "transactions",
+)
+# Non-key columns refreshed when a bar is re-ingested
+AGG_UPDATE_COLUMNS = AGG_COLUMNS[5:]
+
+MAX_PREPARED_PARAMS = 65_535
+
+# Session-level bulk-load tuning, restored once the load completes
+BULK_LOAD_BEGIN_SQL = "SET unique_checks=0, foreign_key_checks=0"
+BULK_LOAD_END_SQL = "SET unique_checks=1, foreign_key_checks=1"
+
+# Bulk path: MySQL parses the staged TSV itself (the COPY equivalent). Empty
+# fields in the nullable columns are loaded as NULL.
+LOAD_INFILE_SQL = """
+LOAD DATA LOCAL INFILE '{path}'
+REPLACE INTO TABLE `aggregates`
+FIELDS TERMINATED BY '\\t'
+LINES TERMINATED BY '\\n'
+(`ticker`,`multiplier`,`timespan`,`ts_ms`,`dt_utc`,`open`,`high`,`low`,`close`,@volume,@vwap,@transactions)
+SET
+  `volume`=NULLIF(@volume,''),
+  `vwap`=NULLIF(@vwap,''),
+  `transactions`=NULLIF(@transactions,'')
 """
+SHOW_WARNINGS_SQL = "SHOW WARNINGS LIMIT 5"
 
 
-def mysql_connect(mysql_cfg: dict) -> MySQLConnection:
+def mysql_connect(mysql_cfg: dict, allow_local_infile: bool = False) -> MySQLConnection:
     conn = mysql.connector.connect(
         host=mysql_cfg["host"],
         port=int(mysql_cfg["port"]),
@@ -123,6 +155,7 @@ def mysql_connect(mysql_cfg: dict) -> MySQLConnection:
         password=mysql_cfg["password"],
         database=mysql_cfg.get("database"),
         autocommit=False,
+        allow_local_infile=allow_local_infile,
     )
     return conn
 
@@ -138,76 +171,243 @@ def mysql_prepare(conn: MySQLConnection, dbname: str) -> None:
         cur.close()
 
 
+@lru_cache(maxsize=8)
+def build_insert_sql(
+    table: str,
+    cols: Tuple[str, ...],
+    update_cols: Tuple[str, ...],
+    n_rows: int,
+) -> str:
+    """
+    Build a single multi-row upsert for `n_rows` rows, so each batch is shipped
+    and parsed as one statement instead of one INSERT per row.
+    """
+    placeholders = "(" + ",".join(["%s"] * len(cols)) + ")"
+    updates = ",".join(f"`{c}`=VALUES(`{c}`)" for c in update_cols)
+    return (
+        f"INSERT INTO `{table}` (" + ",".join(f"`{c}`" for c in cols) + ") "
+        "VALUES " + ",".join([placeholders] * n_rows) + f" ON DUPLICATE KEY UPDATE {updates}"
+    )
+
+
+def _multi_row_insert(
+    cur: Any,
+    table: str,
+    cols: Tuple[str, ...],
+    update_cols: Tuple[str, ...],
+    rows: List[Tuple],
+) -> None:
+    # One round-trip per batch, with the row tuples flattened into the parameter list
+    cur.execute(build_insert_sql(table, cols, update_cols, len(rows)), list(chain.from_iterable(rows)))
+
+
 def chunked(iterable: List[Tuple], size: int) -> Iterable[List[Tuple]]:
     for i in range(0, len(iterable), size):
         yield iterable[i:i + size]
 
 
+def upsert_rows(conn: MySQLConnection, rows: List[Tuple], batch_size: int, commit_every: int) -> int:
+    """
+    Upsert rows in multi-row batches through a server-side prepared statement,
+    so every full-size batch reuses a single parse of the INSERT.
+    """
+    # A prepared statement is limited to 65,535 placeholders
+    batch_size = min(batch_size, MAX_PREPARED_PARAMS // len(AGG_COLUMNS))
+
+    total = 0
+    uncommitted = 0
+    session = conn.cursor()
+    session.execute(BULK_LOAD_BEGIN_SQL)
+    cur = conn.cursor(prepared=True)
+    try:
+        for batch in chunked(rows, batch_size):
+            _multi_row_insert(cur, "aggregates", AGG_COLUMNS, AGG_UPDATE_COLUMNS, batch)
+            total += len(batch)
+            uncommitted += len(batch)
+            if uncommitted >= commit_every:
+                conn.commit()
+                uncommitted = 0
+            print(f"Inserted/updated {total}/{len(rows)}…")
+    finally:
+        cur.close()
+        conn.commit()
+        session.execute(BULK_LOAD_END_SQL)
+        session.close()
+    return total
+
+
+def load_rows_infile(conn: MySQLConnection, rows: List[Tuple]) -> int:
+    """
+    Stage rows to a temporary TSV and bulk load it with LOAD DATA LOCAL INFILE.
+    Existing keys are replaced rather than updated in place.
+
+    LOCAL loads downgrade data errors to warnings (e.g. an empty NOT NULL price
+    is stored as 0), so any warning rolls the load back and raises.
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".tsv", newline="", encoding="utf-8", delete=False
+    ) as f:
+        csv.writer(f, delimiter="\t", lineterminator="\n").writerows(rows)
+        path = f.name
+
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute(LOAD_INFILE_SQL.format(path=path.replace("\\", "/")))
+            warning_count = cur.warning_count
+            if warning_count:
+                cur.execute(SHOW_WARNINGS_SQL)
+                warnings = cur.fetchall()
+                conn.rollback()
+                raise mysql.connector.errors.DataError(
+                    msg=f"LOAD DATA produced {warning_count} warning(s), rolled back: {warnings}",
+                )
+            conn.commit()
+        finally:
+            cur.close()
+    finally:
+        os.unlink(path)
+    return len(rows)
+
+
 # ---------- Polygon fetch + transform ----------
 
-def _get_attr(obj: Any, *names: str, default=None):
-    # Support both dict-like and attribute-style fields with short or long names
+# Aggregate fields as (short, long) name pairs
+AGG_FIELDS = (
+    ("t", "timestamp"),
+    ("o", "open"),
+    ("h", "high"),
+    ("l", "low"),
+    ("c", "close"),
+    ("v", "volume"),
+    ("vw", "vwap"),
+    ("n", "transactions"),
+)
+
+
+def _column(frame: pd.DataFrame, *names: str) -> Optional[pd.Series]:
+    # Support both short-form and long-form field names
     for n in names:
-        if isinstance(obj, dict):
-            if n in obj:
-                return obj[n]
-        else:
-            if hasattr(obj, n):
-                return getattr(obj, n)
-    return default
+        if n in frame:
+            return frame[n]
+    return None
+
+
+def _records_frame(recs: List[Any]) -> pd.DataFrame:
+    """
+    Load Polygon records into a frame with one column per field present.
+    """
+    # The record kind is fixed per SDK version, so sniff it once
+    sample = recs[0]
+    if isinstance(sample, dict):
+        return pd.DataFrame.from_records(recs)
+
+    # Resolve short/long names once, then pull every field per record in one C call
+    names = [
+        long if hasattr(sample, long) else short
+        for short, long in AGG_FIELDS
+        if hasattr(sample, long) or hasattr(sample, short)
+    ]
+    getter = attrgetter(*names)
+    values = list(map(getter, recs))
+    if len(names) == 1:
+        # A single-name attrgetter returns the bare value rather than a tuple
+        values = [(v,) for v in values]
+    return pd.DataFrame.from_records(values, columns=names)
+
+
+def _to_nullable(col: Optional[pd.Series], size: int, integer: bool = False) -> List[Any]:
+    """
+    Coerce a column to Python numbers safe for MySQL, with missing or
+    unparseable values mapped to None.
+    """
+    if col is None:
+        return [None] * size
+    values = pd.to_numeric(col, errors="coerce").astype(np.float64)
+    if integer:
+        values = np.trunc(values).astype("Int64")
+    return values.astype(object).where(values.notna(), None).tolist()
 
 
-def _to_row(
-    rec: Any,
+def _to_rows(
+    recs: List[Any],
     ticker: str,
     multiplier: int,
     timespan: str,
-) -> Tuple:
+) -> List[Tuple]:
     """
-    Map Polygon aggregate record to SQL row.
+    Map Polygon aggregate records to SQL rows, converting whole columns at once.
     Supports both short-form (v,vw,o,c,h,l,t,n) and long-form names.
     """
-    ts_ms = int(_get_attr(rec, "t", "timestamp"))
-    # Some clients may return seconds—defend against it
-    if ts_ms < 10_000_000_000:  # seconds epoch
-        ts_ms *= 1000
-
-    dt = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).replace(tzinfo=None)
-
-    o = _get_attr(rec, "o", "open", default=None)
-    h = _get_attr(rec, "h", "high", default=None)
-    l = _get_attr(rec, "l", "low", default=None)
-    c = _get_attr(rec, "c", "close", default=None)
-    v = _get_attr(rec, "v", "volume", default=None)
-    vw = _get_attr(rec, "vw", "vwap", default=None)
-    n = _get_attr(rec, "n", "transactions", default=None)
-
-    # Ensure numeric types are safe for MySQL
-    def to_num(x):
-        if x is None:
-            return None
-        try:
-            return float(x)
-        except Exception:
-            return None
+    if not recs:
+        return []
 
-    return (
-        ticker,
-        multiplier,
-        timespan,
-        ts_ms,
-        dt,
-        to_num(o),
-        to_num(h),
-        to_num(l),
-        to_num(c),
-        int(v) if v is not None and not isinstance(v, bool) else None,
-        to_num(vw),
-        int(n) if n is not None and not isinstance(n, bool) else None,
+    frame = _records_frame(recs)
+    size = len(frame)
+
+    ts_ms = _column(frame, "t", "timestamp").to_numpy(dtype=np.int64)
+    # Some clients may return seconds—defend against it
+    ts_ms = np.where(ts_ms < 10_000_000_000, ts_ms * 1000, ts_ms)
+    dt = ts_ms.astype("datetime64[ms]").tolist()
+
+    return list(
+        zip(
+            repeat(ticker, size),
+            repeat(multiplier, size),
+            repeat(timespan, size),
+            ts_ms.tolist(),
+            dt,
+            _to_nullable(_column(frame, "o", "open"), size),
+            _to_nullable(_column(frame, "h", "high"), size),
+            _to_nullable(_column(frame, "l", "low"), size),
+            _to_nullable(_column(frame, "c", "close"), size),
+            _to_nullable(_column(frame, "v", "volume"), size, integer=True),
+            _to_nullable(_column(frame, "vw", "vwap"), size),
+            _to_nullable(_column(frame, "n", "transactions"), size, integer=True),
+        ),
     )
 
 
-def fetch_aggregates(
+# Bar lengths in seconds; longer units (week, month, quarter, year) always span months
+TIMESPAN_SECONDS = {"second": 1, "minute": 60, "hour": 3_600, "day": 86_400}
+
+
+def splits_by_month(timespan: str, multiplier: int) -> bool:
+    """
+    Return whether bars of this size can never cross a month boundary.
+    Only bars of at most one day qualify; longer bars span months, so a window
+    split would return partial versions of the same bar.
+    """
+    unit_seconds = TIMESPAN_SECONDS.get(timespan.lower())
+    return unit_seconds is not None and multiplier * unit_seconds <= 86_400
+
+
+def monthly_ranges(start_date: Any, end_date: Any) -> List[Tuple[str, str]]:
+    """
+    Split an inclusive YYYY-MM-DD range into calendar-month windows.
+    Bounds that are not ISO dates (e.g. ms epochs) or a reversed range are
+    kept as a single window, left for Polygon to interpret.
+    """
+    try:
+        start = date.fromisoformat(str(start_date))
+        end = date.fromisoformat(str(end_date))
+    except ValueError:
+        return [(start_date, end_date)]
+
+    if start > end:
+        return [(start_date, end_date)]
+
+    ranges: List[Tuple[str, str]] = []
+    window_start = start
+    while window_start <= end:
+        next_month = (window_start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        window_end = min(end, next_month - timedelta(days=1))
+        ranges.append((window_start.isoformat(), window_end.isoformat()))
+        window_start = next_month
+    return ranges
+
+
+def _fetch_window(
     client: RESTClient,
     *,
     ticker: str,
@@ -218,36 +418,82 @@ def fetch_aggregates(
     adjusted: bool,
     sort: str,
     limit: int,
-    retries: int = 5,
-    backoff_base: float = 0.75,
+    retries: int,
+    backoff_base: float,
 ) -> List[Any]:
-    """
-    Pull aggregates using Polygon's generator, with simple retry/backoff.
-    """
-    items: List[Any] = []
     attempt = 0
     while True:
         try:
-            for a in client.list_aggs(
-                ticker=ticker,
-                multiplier=multiplier,
-                timespan=timespan,
-                from_=start_date,
-                to=end_date,
-                adjusted=adjusted,
-                sort=sort,
-                limit=limit,
-            ):
-                items.append(a.__dict__ if hasattr(a, "__dict__") else a)
-            break  # success
+            # Records are kept as returned; `_to_rows` handles both dicts and objects
+            return list(
+                client.list_aggs(
+                    ticker=ticker,
+                    multiplier=multiplier,
+                    timespan=timespan,
+                    from_=start_date,
+                    to=end_date,
+                    adjusted=adjusted,
+                    sort=sort,
+                    limit=limit,
+                ),
+            )  # success
         except Exception as e:
             attempt += 1
             if attempt > retries:
                 raise
             sleep_s = backoff_base * (2 ** (attempt - 1))
-            print(f"[WARN] list_aggs failed (attempt {attempt}/{retries}): {e}. Backing off {sleep_s:.2f}s")
+            print(
+                f"[WARN] list_aggs {start_date} → {end_date} failed (attempt {attempt}/{retries}): {e}. "
+                f"Backing off {sleep_s:.2f}s"
+            )
             time.sleep(sleep_s)
-    return items
+
+
+def fetch_aggregates(
+    client: RESTClient,
+    *,
+    ticker: str,
+    multiplier: int,
+    timespan: str,
+    start_date: str,
+    end_date: str,
+    adjusted: bool,
+    sort: str,
+    limit: int,
+    retries: int = 5,
+    backoff_base: float = 0.75,
+    max_workers: int = 8,
+) -> List[Any]:
+    """
+    Pull aggregates using Polygon's generator, with simple retry/backoff.
+    When bars cannot cross a month boundary the range is fetched as monthly
+    windows on a thread pool (the work is network-bound), then stitched back
+    together in `sort` order.
+    """
+    if splits_by_month(timespan, multiplier):
+        windows = monthly_ranges(start_date, end_date)
+    else:
+        windows = [(start_date, end_date)]
+    if sort == "desc":
+        windows.reverse()
+
+    def fetch(window: Tuple[str, str]) -> List[Any]:
+        return _fetch_window(
+            client,
+            ticker=ticker,
+            multiplier=multiplier,
+            timespan=timespan,
+            start_date=window[0],
+            end_date=window[1],
+            adjusted=adjusted,
+            sort=sort,
+            limit=limit,
+            retries=retries,
+            backoff_base=backoff_base,
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(windows)))) as executor:
+        return list(chain.from_iterable(executor.map(fetch, windows)))
 
 
 # ---------- Main flow ----------
@@ -259,6 +505,18 @@ def main():
     parser.add_argument("--start", help="Override start date (YYYY-MM-DD or ms epoch)")
     parser.add_argument("--end", help="Override end date (YYYY-MM-DD or ms epoch)")
     parser.add_argument("--batch-size", type=int, default=1000, help="Rows per INSERT batch")
+    parser.add_argument(
+        "--commit-every",
+        type=int,
+        default=100_000,
+        help="Rows per transaction (commits are fsync-bound, so keep this large)",
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent Polygon fetch windows")
+    parser.add_argument(
+        "--load-infile",
+        action="store_true",
+        help="Bulk load via LOAD DATA LOCAL INFILE (requires local_infile=ON on the server)",
+    )
     args = parser.parse_args()
 
     cfg = load_config(args.config)
@@ -285,25 +543,20 @@ def main():
         adjusted=poly["adjusted"],
         sort=poly["sort"],
         limit=poly["limit"],
+        max_workers=args.workers,
     )
 
     print(f"Fetched {len(recs)} records. Preparing MySQL…")
 
-    conn = mysql_connect(mysql_cfg)
+    conn = mysql_connect(mysql_cfg, allow_local_infile=args.load_infile)
     try:
         mysql_prepare(conn, mysql_cfg["database"])
-        rows = [_to_row(r, poly["stocksTicker"], poly["multiplier"], poly["timespan"]) for r in recs]
+        rows = _to_rows(recs, poly["stocksTicker"], poly["multiplier"], poly["timespan"])
 
-        total = 0
-        cur = conn.cursor()
-        try:
-            for batch in chunked(rows, args.batch_size):
-                cur.executemany(INSERT_SQL, batch)
-                conn.commit()
-                total += len(batch)
-                print(f"Inserted/updated {total}/{len(rows)}…")
-        finally:
-            cur.close()
+        if args.load_infile:
+            total = load_rows_infile(conn, rows)
+        else:
+            total = upsert_rows(conn, rows, args.batch_size, args.commit_every)
 
         print(f"Done. Upserted {total} rows into `{mysql_cfg['database']}`.`aggregates`.")
     finally:
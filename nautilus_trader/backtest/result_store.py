@@ -14,23 +14,109 @@
 # -------------------------------------------------------------------------------------------------
 from __future__ import annotations
 
-import json
-from dataclasses import asdict
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Self
+
+import msgspec
+import numpy as np
 
 from .results import BacktestResult
 
 
+def _encode_hook(obj: Any) -> Any:
+    # Analyzer statistics may be returned as NumPy scalars
+    if isinstance(obj, np.generic):
+        return obj.item()
+
+    raise TypeError(f"Encoding objects of type {obj.__class__} is unsupported")
+
+
+_ENCODER = msgspec.json.Encoder(enc_hook=_encode_hook)
+
+
+class ResultWriter:
+    """
+    Appends backtest results with metadata to a JSON lines file.
+
+    The file is held open for the lifetime of the writer (use as a context
+    manager), so a sweep appending many results avoids reopening it per record.
+
+    Parameters
+    ----------
+    output_path : str | Path
+        The path to the JSON lines file.
+    flush_interval : int, default 100
+        The number of records written between explicit flushes.
+
+    """
+
+    def __init__(self, output_path: str | Path, flush_interval: int = 100) -> None:
+        self._path = Path(output_path)
+        self._flush_interval = flush_interval
+        self._pending = 0
+        self._file: BinaryIO | None = None
+        self._buffer = bytearray()  # Reused across writes by `encode_into`
+
+    def __enter__(self) -> Self:
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """
+        Open the output file for appending, creating parent directories as needed.
+
+        Raises
+        ------
+        RuntimeError
+            If the writer is already open.
+
+        """
+        if self._file is not None:
+            raise RuntimeError("`ResultWriter` is already open")
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self._path.open("ab")
+
+    def write(self, result: BacktestResult, strategy_id: str) -> None:
+        """
+        Append the given result tagged with the strategy ID.
+
+        Raises
+        ------
+        RuntimeError
+            If the writer is not open.
+
+        """
+        if self._file is None:
+            raise RuntimeError("`ResultWriter` is not open")
+
+        # Shallow copy of the fields, avoiding the recursive copy made by `asdict`
+        record: dict[str, Any] = {**vars(result), "strategy_id": strategy_id}
+        _ENCODER.encode_into(record, self._buffer)
+        self._buffer.extend(b"\n")
+        self._file.write(self._buffer)
+
+        self._pending += 1
+        if self._pending >= self._flush_interval:
+            self._file.flush()
+            self._pending = 0
+
+    def close(self) -> None:
+        """
+        Flush and close the output file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._pending = 0
+
+
 def store_result(result: BacktestResult, strategy_id: str, output_path: str | Path) -> None:
     """
     Append a backtest result with metadata to a JSON lines file.
     """
-    record: dict[str, Any] = asdict(result)
-    record["strategy_id"] = strategy_id
-
-    path = Path(output_path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        json.dump(record, f)
-        f.write("\n")
+    with ResultWriter(output_path) as writer:
+        writer.write(result, strategy_id)
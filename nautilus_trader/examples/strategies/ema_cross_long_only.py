@@ -34,6 +34,7 @@ from nautilus_trader.model.enums import OrderSide
 from nautilus_trader.model.enums import TimeInForce
 from nautilus_trader.model.identifiers import InstrumentId
 from nautilus_trader.model.instruments import Instrument
+from nautilus_trader.model.objects import Quantity
 from nautilus_trader.model.orders import MarketOrder
 from nautilus_trader.trading.strategy import Strategy
 
@@ -103,6 +104,7 @@ class EMACrossLongOnly(Strategy):
         super().__init__(config)
 
         self.instrument: Instrument = None  # Initialized in on_start
+        self.trade_qty: Quantity = None  # Initialized in on_start
 
         # Create the indicators for the strategy
         self.fast_ema = ExponentialMovingAverage(config.fast_ema_period)
@@ -118,6 +120,9 @@ class EMACrossLongOnly(Strategy):
             self.stop()
             return
 
+        # The trade size is fixed by the frozen config, so convert it once
+        self.trade_qty = self.instrument.make_qty(self.config.trade_size)
+
         # Register the indicators for updating
         self.register_indicator_for_bars(self.config.bar_type, self.fast_ema)
         self.register_indicator_for_bars(self.config.bar_type, self.slow_ema)
@@ -244,7 +249,7 @@ class EMACrossLongOnly(Strategy):
         order: MarketOrder = self.order_factory.market(
             instrument_id=self.config.instrument_id,
             order_side=OrderSide.BUY,
-            quantity=self.instrument.make_qty(self.config.trade_size),
+            quantity=self.trade_qty,
             time_in_force=TimeInForce.IOC,
         )
 
@@ -1,44 +1,36 @@
-import importlib.util
+# -------------------------------------------------------------------------------------------------
+#  Copyright (C) 2015-2025 Nautech Systems Pty Ltd. All rights reserved.
+#  https://nautechsystems.io
+#
+#  Licensed under the GNU Lesser General Public License Version 3.0 (the "License");
+#  You may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at https://www.gnu.org/licenses/lgpl-3.0.en.html
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -------------------------------------------------------------------------------------------------
+
 import json
-import sys
-import types
 from pathlib import Path
 
+import numpy as np
+import pytest
 
-def _load_module(path: Path, name: str):
-    spec = importlib.util.spec_from_file_location(name, path)
-    assert spec is not None and spec.loader is not None
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[name] = module
-    spec.loader.exec_module(module)
-    return module
-
-
-repo_root = Path(__file__).resolve().parents[3]
-pkg = types.ModuleType("nautilus_trader")
-pkg.__path__ = [str(repo_root / "nautilus_trader")]
-sys.modules["nautilus_trader"] = pkg
-
-_results = _load_module(
-    repo_root / "nautilus_trader" / "backtest" / "results.py",
-    "nautilus_trader.backtest.results",
-)
-_store = _load_module(
-    repo_root / "nautilus_trader" / "backtest" / "result_store.py",
-    "nautilus_trader.backtest.result_store",
-)
+from nautilus_trader.backtest.result_store import ResultWriter
+from nautilus_trader.backtest.result_store import store_result
+from nautilus_trader.backtest.results import BacktestResult
 
-BacktestResult = _results.BacktestResult
-store_result = _store.store_result
 
-
-def test_store_result_appends_json(tmp_path: Path) -> None:
-    result = BacktestResult(
+def _make_result(run_id: str = "R") -> BacktestResult:
+    return BacktestResult(
         trader_id="T",
         machine_id="M",
         run_config_id=None,
         instance_id="I",
-        run_id="R",
+        run_id=run_id,
         run_started=None,
         run_finished=None,
         backtest_start=None,
@@ -51,6 +43,10 @@ def test_store_result_appends_json(tmp_path: Path) -> None:
         stats_pnls={},
         stats_returns={},
     )
+
+
+def test_store_result_appends_json(tmp_path: Path) -> None:
+    result = _make_result()
     output_file = tmp_path / "results.jsonl"
     store_result(result, "STRAT-1", output_file)
 
@@ -59,3 +55,43 @@ def test_store_result_appends_json(tmp_path: Path) -> None:
 
     assert data["strategy_id"] == "STRAT-1"
     assert data["run_id"] == "R"
+
+
+def test_result_writer_appends_each_result(tmp_path: Path) -> None:
+    output_file = tmp_path / "nested" / "results.jsonl"
+    store_result(_make_result("R0"), "STRAT-0", output_file)
+
+    with ResultWriter(output_file, flush_interval=2) as writer:
+        for i in range(1, 4):
+            writer.write(_make_result(f"R{i}"), f"STRAT-{i}")
+
+    with output_file.open("r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+
+    assert [r["run_id"] for r in records] == ["R0", "R1", "R2", "R3"]
+    assert [r["strategy_id"] for r in records] == ["STRAT-0", "STRAT-1", "STRAT-2", "STRAT-3"]
+
+
+def test_store_result_encodes_numpy_statistics(tmp_path: Path) -> None:
+    result = _make_result()
+    result.stats_pnls = {"USD": {"PnL (total)": np.float64(12.5)}}
+    result.stats_returns = {"Sharpe Ratio (252 days)": np.float64(1.25), "Max Winner": np.int64(3)}
+    output_file = tmp_path / "results.jsonl"
+    store_result(result, "STRAT-1", output_file)
+
+    with output_file.open("r", encoding="utf-8") as f:
+        data = json.loads(f.readline())
+
+    assert data["stats_pnls"] == {"USD": {"PnL (total)": 12.5}}
+    assert data["stats_returns"] == {"Sharpe Ratio (252 days)": 1.25, "Max Winner": 3}
+
+
+def test_result_writer_open_twice_raises(tmp_path: Path) -> None:
+    with ResultWriter(tmp_path / "results.jsonl") as writer:
+        with pytest.raises(RuntimeError, match="already open"):
+            writer.open()
+
+        writer.write(_make_result(), "STRAT-1")
+
+    writer.open()  # Can be reopened once closed
+    writer.close()
@@ -0,0 +1,123 @@
+# -------------------------------------------------------------------------------------------------
+#  Copyright (C) 2015-2025 Nautech Systems Pty Ltd. All rights reserved.
+#  https://nautechsystems.io
+#
+#  Licensed under the GNU Lesser General Public License Version 3.0 (the "License");
+#  You may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at https://www.gnu.org/licenses/lgpl-3.0.en.html
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -------------------------------------------------------------------------------------------------
+
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nautilus_trader.model.data import BarType
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+
+# The loader needs the MySQL driver, which is not a core dependency
+pytest.importorskip("mysql.connector")
+
+from hist_generation.mysql_to_bars import BARS_WHERE_SQL
+from hist_generation.mysql_to_bars import _bars_filter
+from hist_generation.mysql_to_bars import _bars_from_frame
+from hist_generation.mysql_to_bars import _to_epoch_ms
+
+
+INSTRUMENT = TestInstrumentProvider.equity(symbol="AAPL", venue="XNAS")
+BAR_TYPE = BarType.from_str(f"{INSTRUMENT.id}-1-MINUTE-LAST-EXTERNAL")
+
+
+def _frame(rows: list[tuple[float, float, float, float, float]]) -> pd.DataFrame:
+    index = pd.date_range("2024-01-02 14:30", periods=len(rows), freq="1min", name="timestamp")
+    return pd.DataFrame(rows, index=index, columns=["open", "high", "low", "close", "volume"])
+
+
+def test_bars_from_frame_rounds_half_cents_away_from_zero() -> None:
+    # High rounds up to 10.13, so the bar is valid at price precision 2
+    df = _frame([(10.10, 10.125, 10.10, 10.13, 100.0)])
+
+    bars = _bars_from_frame(df, BAR_TYPE, INSTRUMENT)
+
+    assert bars[0].high.as_double() == 10.13
+
+
+def test_bars_from_frame_builds_valid_bars() -> None:
+    df = _frame([(10.0, 11.0, 9.5, 10.5, 100.0), (10.5, 10.5, 10.5, 10.5, 0.0)])
+
+    bars = _bars_from_frame(df, BAR_TYPE, INSTRUMENT)
+
+    assert len(bars) == 2
+    assert bars[0].high.as_double() == 11.0
+    assert bars[1].ts_event == df.index[1].value
+
+
+@pytest.mark.parametrize(
+    "row",
+    [
+        (10.0, 9.0, 8.0, 8.5, 100.0),  # high < open
+        (10.0, 11.0, 10.6, 10.5, 100.0),  # low > close
+        (10.0, 11.0, 9.5, 12.0, 100.0),  # high < close
+        (10.0, 11.0, 9.5, np.nan, 100.0),  # missing close
+        (10.0, 11.0, 9.5, 10.5, np.nan),  # missing volume
+        (10.12, 10.13, 10.125, 10.12, 100.0),  # low rounds up to 10.13 > open
+    ],
+)
+def test_bars_from_frame_rejects_invalid_row(row: tuple[float, float, float, float, float]) -> None:
+    df = _frame([(10.0, 11.0, 9.5, 10.5, 100.0), row])
+
+    with pytest.raises(ValueError, match="first at row 1"):
+        _bars_from_frame(df, BAR_TYPE, INSTRUMENT)
+
+
+def test_to_epoch_ms_treats_naive_as_utc() -> None:
+    assert _to_epoch_ms(datetime(2023, 11, 14, 22, 13, 20)) == 1_700_000_000_000
+
+
+def test_to_epoch_ms_converts_aware_to_utc() -> None:
+    eastern = timezone(timedelta(hours=-5))
+
+    assert _to_epoch_ms(datetime(2023, 11, 14, 17, 13, 20, tzinfo=eastern)) == 1_700_000_000_000
+
+
+def test_bars_filter_without_bounds() -> None:
+    where, params = _bars_filter("AAPL", 1, "minute", None, None)
+
+    assert where == BARS_WHERE_SQL
+    assert params == ("AAPL", 1, "minute")
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "predicates", "bounds"),
+    [
+        (datetime(2023, 11, 14, 22, 13, 20), None, " AND ts_ms >= %s", (1_700_000_000_000,)),
+        (None, datetime(2023, 11, 14, 22, 13, 20), " AND ts_ms <= %s", (1_700_000_000_000,)),
+        (
+            datetime(2023, 11, 14, 22, 13, 20),
+            datetime(2023, 11, 14, 22, 13, 21, tzinfo=UTC),
+            " AND ts_ms >= %s AND ts_ms <= %s",
+            (1_700_000_000_000, 1_700_000_001_000),
+        ),
+    ],
+)
+def test_bars_filter_adds_only_given_bounds(
+    start: datetime | None,
+    end: datetime | None,
+    predicates: str,
+    bounds: tuple[int, ...],
+) -> None:
+    where, params = _bars_filter("AAPL", 1, "minute", start, end)
+
+    assert where == BARS_WHERE_SQL + predicates
+    assert params == ("AAPL", 1, "minute", *bounds)
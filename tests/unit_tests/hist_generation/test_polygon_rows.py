@@ -0,0 +1,158 @@
+# -------------------------------------------------------------------------------------------------
+#  Copyright (C) 2015-2025 Nautech Systems Pty Ltd. All rights reserved.
+#  https://nautechsystems.io
+#
+#  Licensed under the GNU Lesser General Public License Version 3.0 (the "License");
+#  You may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at https://www.gnu.org/licenses/lgpl-3.0.en.html
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -------------------------------------------------------------------------------------------------
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+
+# The ingest script needs the Polygon client and MySQL driver, which are not core dependencies
+pytest.importorskip("polygon")
+pytest.importorskip("mysql.connector")
+
+from hist_generation.polygon_to_mysql import AGG_COLUMNS
+from hist_generation.polygon_to_mysql import AGG_UPDATE_COLUMNS
+from hist_generation.polygon_to_mysql import _multi_row_insert
+from hist_generation.polygon_to_mysql import _to_nullable
+from hist_generation.polygon_to_mysql import _to_rows
+from hist_generation.polygon_to_mysql import build_insert_sql
+
+
+TS_MS = 1_700_000_000_000
+DT = datetime(2023, 11, 14, 22, 13, 20)
+
+
+class _RecordingCursor:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, list]] = []
+
+    def execute(self, sql: str, params: list) -> None:
+        self.calls.append((sql, params))
+
+
+def test_to_rows_empty() -> None:
+    assert _to_rows([], "AAPL", 1, "minute") == []
+
+
+def test_to_rows_dict_records_with_short_names() -> None:
+    recs = [{"t": TS_MS, "o": 1.5, "h": 2.0, "l": 1.0, "c": 1.75, "v": 100, "vw": 1.6, "n": 7}]
+
+    rows = _to_rows(recs, "AAPL", 1, "minute")
+
+    assert rows == [("AAPL", 1, "minute", TS_MS, DT, 1.5, 2.0, 1.0, 1.75, 100, 1.6, 7)]
+
+
+def test_to_rows_attribute_records_with_long_names() -> None:
+    recs = [
+        SimpleNamespace(
+            timestamp=TS_MS,
+            open=1.5,
+            high=2.0,
+            low=1.0,
+            close=1.75,
+            volume=100.0,
+            vwap=None,
+            transactions=None,
+        ),
+    ]
+
+    rows = _to_rows(recs, "AAPL", 5, "minute")
+
+    assert rows == [("AAPL", 5, "minute", TS_MS, DT, 1.5, 2.0, 1.0, 1.75, 100, None, None)]
+
+
+def test_to_rows_attribute_records_with_short_names() -> None:
+    recs = [SimpleNamespace(t=TS_MS, o=1.5, h=2.0, l=1.0, c=1.75, v=100, vw=1.6, n=7)]
+
+    rows = _to_rows(recs, "AAPL", 1, "minute")
+
+    assert rows == [("AAPL", 1, "minute", TS_MS, DT, 1.5, 2.0, 1.0, 1.75, 100, 1.6, 7)]
+
+
+def test_to_rows_single_field_attribute_records() -> None:
+    recs = [SimpleNamespace(t=TS_MS), SimpleNamespace(t=TS_MS + 60_000)]
+
+    rows = _to_rows(recs, "AAPL", 1, "minute")
+
+    assert [row[3] for row in rows] == [TS_MS, TS_MS + 60_000]
+    assert all(row[5:] == (None,) * 7 for row in rows)
+
+
+def test_to_rows_normalizes_second_timestamps_to_ms() -> None:
+    recs = [{"t": TS_MS // 1000, "o": 1.0, "h": 1.0, "l": 1.0, "c": 1.0}]
+
+    (row,) = _to_rows(recs, "AAPL", 1, "minute")
+
+    assert row[3] == TS_MS
+    assert row[4] == DT
+
+
+def test_to_rows_returns_python_scalars() -> None:
+    recs = [{"t": TS_MS, "o": 1.5, "h": 2.0, "l": 1.0, "c": 1.75, "v": 100.0, "vw": 1.6, "n": 7.0}]
+
+    (row,) = _to_rows(recs, "AAPL", 1, "minute")
+
+    assert [type(v) for v in row[3:]] == [int, datetime, float, float, float, float, int, float, int]
+
+
+def test_to_nullable_missing_column() -> None:
+    assert _to_nullable(None, 3) == [None, None, None]
+
+
+def test_to_nullable_maps_missing_and_unparseable_values_to_none() -> None:
+    col = pd.Series([1.5, None, float("nan"), "bad", "2.25"])
+
+    assert _to_nullable(col, len(col)) == [1.5, None, None, None, 2.25]
+
+
+def test_to_nullable_truncates_integers() -> None:
+    col = pd.Series([10.9, -2.7, None, 3])
+
+    values = _to_nullable(col, len(col), integer=True)
+
+    assert values == [10, -2, None, 3]
+    assert [type(v) for v in values] == [int, int, type(None), int]
+
+
+def test_build_insert_sql_placeholders_and_update_clause() -> None:
+    sql = build_insert_sql("aggregates", ("a", "b", "c"), ("c",), 2)
+
+    assert sql == "INSERT INTO `aggregates` (`a`,`b`,`c`) VALUES (%s,%s,%s),(%s,%s,%s) ON DUPLICATE KEY UPDATE `c`=VALUES(`c`)"
+
+
+def test_build_insert_sql_for_aggregates() -> None:
+    sql = build_insert_sql("aggregates", AGG_COLUMNS, AGG_UPDATE_COLUMNS, 3)
+
+    assert sql.count("%s") == 3 * len(AGG_COLUMNS)
+    assert AGG_UPDATE_COLUMNS == ("open", "high", "low", "close", "volume", "vwap", "transactions")
+    for col in AGG_UPDATE_COLUMNS:
+        assert f"`{col}`=VALUES(`{col}`)" in sql
+    assert "`ts_ms`=VALUES" not in sql
+
+
+def test_multi_row_insert_flattens_rows_into_one_statement() -> None:
+    cur = _RecordingCursor()
+    rows = [(1, "x"), (2, "y"), (3, None)]
+
+    _multi_row_insert(cur, "t", ("id", "name"), ("name",), rows)
+
+    assert cur.calls == [
+        (
+            "INSERT INTO `t` (`id`,`name`) VALUES (%s,%s),(%s,%s),(%s,%s) ON DUPLICATE KEY UPDATE `name`=VALUES(`name`)",
+            [1, "x", 2, "y", 3, None],
+        ),
+    ]
@@ -0,0 +1,197 @@
+# -------------------------------------------------------------------------------------------------
+#  Copyright (C) 2015-2025 Nautech Systems Pty Ltd. All rights reserved.
+#  https://nautechsystems.io
+#
+#  Licensed under the GNU Lesser General Public License Version 3.0 (the "License");
+#  You may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at https://www.gnu.org/licenses/lgpl-3.0.en.html
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -------------------------------------------------------------------------------------------------
+
+import os
+from datetime import date
+from datetime import datetime
+
+import pytest
+
+
+# The ingest script needs the Polygon client and MySQL driver, which are not core dependencies
+pytest.importorskip("polygon")
+pytest.importorskip("mysql.connector")
+
+from mysql.connector.errors import DataError
+
+from hist_generation.polygon_to_mysql import fetch_aggregates
+from hist_generation.polygon_to_mysql import load_rows_infile
+from hist_generation.polygon_to_mysql import monthly_ranges
+from hist_generation.polygon_to_mysql import splits_by_month
+
+
+class _RecordingClient:
+    def __init__(self) -> None:
+        self.windows: list[tuple[str, str]] = []
+
+    def list_aggs(self, *, from_, to, **kwargs):
+        self.windows.append((from_, to))
+        return [{"t": from_}]
+
+
+class _InfileCursor:
+    def __init__(self, warning_count: int) -> None:
+        self.warning_count = warning_count
+        self.statements: list[str] = []
+        self.staged = ""
+
+    def execute(self, sql: str) -> None:
+        self.statements.append(sql)
+        if sql.lstrip().startswith("LOAD DATA"):
+            path = sql.split("'")[1]
+            with open(path, encoding="utf-8") as f:
+                self.staged = f.read()
+            self.path = path
+
+    def fetchall(self) -> list[tuple]:
+        return [("Warning", 1366, "Incorrect decimal value: '' for column 'open' at row 1")]
+
+    def close(self) -> None:
+        pass
+
+
+class _InfileConnection:
+    def __init__(self, warning_count: int) -> None:
+        self.cur = _InfileCursor(warning_count)
+        self.committed = False
+        self.rolled_back = False
+
+    def cursor(self) -> _InfileCursor:
+        return self.cur
+
+    def commit(self) -> None:
+        self.committed = True
+
+    def rollback(self) -> None:
+        self.rolled_back = True
+
+
+ROW = ("AAPL", 1, "minute", 1700000000000, datetime(2023, 11, 14, 22, 13, 20), 1.0, 2.0, 0.5, 1.5, None, None, 3)
+
+
+def test_load_rows_infile_commits_clean_load() -> None:
+    conn = _InfileConnection(warning_count=0)
+
+    assert load_rows_infile(conn, [ROW]) == 1
+
+    assert conn.committed
+    assert not conn.rolled_back
+    assert conn.cur.staged == "AAPL\t1\tminute\t1700000000000\t2023-11-14 22:13:20\t1.0\t2.0\t0.5\t1.5\t\t\t3\n"
+    assert not os.path.exists(conn.cur.path)
+
+
+def test_load_rows_infile_rolls_back_on_warnings() -> None:
+    conn = _InfileConnection(warning_count=1)
+
+    with pytest.raises(DataError, match="1 warning"):
+        load_rows_infile(conn, [ROW])
+
+    assert conn.rolled_back
+    assert not conn.committed
+    assert not os.path.exists(conn.cur.path)
+
+
+def test_monthly_ranges_splits_at_month_ends() -> None:
+    assert monthly_ranges("2023-11-15", "2024-01-31") == [
+        ("2023-11-15", "2023-11-30"),
+        ("2023-12-01", "2023-12-31"),
+        ("2024-01-01", "2024-01-31"),
+    ]
+
+
+def test_monthly_ranges_single_day() -> None:
+    assert monthly_ranges("2024-03-31", "2024-03-31") == [("2024-03-31", "2024-03-31")]
+
+
+@pytest.mark.parametrize(
+    ("year", "last_day"),
+    [
+        (2024, "2024-02-29"),
+        (2023, "2023-02-28"),
+        (2000, "2000-02-29"),
+        (1900, "1900-02-28"),
+    ],
+)
+def test_monthly_ranges_handles_leap_years(year: int, last_day: str) -> None:
+    ranges = monthly_ranges(f"{year}-02-10", f"{year}-03-02")
+
+    assert ranges == [(f"{year}-02-10", last_day), (f"{year}-03-01", f"{year}-03-02")]
+
+
+def test_monthly_ranges_accepts_yaml_dates() -> None:
+    assert monthly_ranges(date(2024, 12, 5), date(2025, 1, 1)) == [
+        ("2024-12-05", "2024-12-31"),
+        ("2025-01-01", "2025-01-01"),
+    ]
+
+
+def test_monthly_ranges_keeps_reversed_range_as_single_window() -> None:
+    assert monthly_ranges("2024-03-01", "2024-01-01") == [("2024-03-01", "2024-01-01")]
+
+
+def test_monthly_ranges_keeps_epoch_bounds_as_single_window() -> None:
+    assert monthly_ranges("1700000000000", "1800000000000") == [("1700000000000", "1800000000000")]
+
+
+@pytest.mark.parametrize(
+    ("timespan", "multiplier", "expected"),
+    [
+        ("second", 30, True),
+        ("minute", 5, True),
+        ("hour", 1, True),
+        ("hour", 24, True),
+        ("hour", 48, False),
+        ("minute", 4320, False),
+        ("day", 1, True),
+        ("day", 2, False),
+        ("week", 1, False),
+        ("month", 1, False),
+        ("quarter", 1, False),
+        ("year", 1, False),
+    ],
+)
+def test_splits_by_month(timespan: str, multiplier: int, expected: bool) -> None:
+    assert splits_by_month(timespan, multiplier) is expected
+
+
+@pytest.mark.parametrize(
+    ("timespan", "multiplier", "expected_windows"),
+    [
+        ("minute", 1, [("2024-01-15", "2024-01-31"), ("2024-02-01", "2024-02-10")]),
+        ("week", 1, [("2024-01-15", "2024-02-10")]),
+        ("day", 3, [("2024-01-15", "2024-02-10")]),
+    ],
+)
+def test_fetch_aggregates_windows_by_bar_size(
+    timespan: str,
+    multiplier: int,
+    expected_windows: list[tuple[str, str]],
+) -> None:
+    client = _RecordingClient()
+
+    items = fetch_aggregates(
+        client,
+        ticker="AAPL",
+        multiplier=multiplier,
+        timespan=timespan,
+        start_date="2024-01-15",
+        end_date="2024-02-10",
+        adjusted=True,
+        sort="asc",
+        limit=50_000,
+    )
+
+    assert sorted(client.windows) == expected_windows
+    assert items == [{"t": start} for start, _ in expected_windows]